@@ -0,0 +1,243 @@
+import json
+import os
+import subprocess
+import sys
+from contextlib import closing
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+
+import compute_completion_status  # noqa: E402
+import merge_vcpkg_package_list_progress as merge  # noqa: E402
+import progress_store  # noqa: E402
+
+VCPKG_PACKAGES = {
+    "header": {"generated_date": 1763830113, "vcpkg_commit_hash": "edffab1bcd2cb5b8c17d6ba34d5651ea0bf82979"},
+    "ports": [
+        {"name": "fmt", "version": "12.1.0", "homepage": "https://github.com/fmtlib/fmt", "status": "❔",
+         "current_min_cpp_version": "Unknown", "tracking_issue": "", "modules_support_date": "",
+         "modules_native": "", "revision_count": 65},
+        {"name": "zlib", "version": "1.3.1", "homepage": "https://www.zlib.net/", "status": "❔",
+         "current_min_cpp_version": "Unknown", "tracking_issue": "", "modules_support_date": "",
+         "modules_native": "", "revision_count": 40},
+        {"name": "cpp-lazy", "version": "8.0.1", "homepage": "", "status": "❔",
+         "current_min_cpp_version": "Unknown", "tracking_issue": "", "modules_support_date": "",
+         "modules_native": "", "revision_count": 1},
+    ],
+}
+
+VCPKG_OVERRIDES = """\
+ports:
+- name: fmt
+  import_statement: fmt
+  modules_support_date: 2022-10-11
+  status: ✅
+  current_min_cpp_version: 11
+  tracking_issue: "https://github.com/fmtlib/fmt/pull/3134"
+"""
+
+EXTERNAL_PROJECTS = """\
+projects:
+- name: cpp-lazy
+  homepage: https://github.com/Kaaserne/cpp-lazy
+  modules_support_date: 2025-05-15
+  status: ✅
+"""
+
+
+def write_data_files(root: Path, excluded: list[str]) -> None:
+    generated = root / "data" / "generated"
+    generated.mkdir(parents=True, exist_ok=True)
+    with (generated / "vcpkg_packages.yml").open("w", encoding="utf-8") as f:
+        yaml.dump(VCPKG_PACKAGES, f, default_flow_style=False, allow_unicode=True)
+    (root / "data" / "vcpkg_overrides.yml").write_text(VCPKG_OVERRIDES, encoding="utf-8")
+    (root / "data" / "external_projects.yml").write_text(EXTERNAL_PROJECTS, encoding="utf-8")
+    write_excluded(root, excluded)
+
+
+def write_excluded(root: Path, excluded: list[str]) -> None:
+    with (root / "data" / "excluded_c_libraries.yml").open("w", encoding="utf-8") as f:
+        yaml.safe_dump({"libraries": excluded}, f)
+
+
+def run_merge(root: Path, db_file: Path | None = None) -> str:
+    data = root / "data"
+    output = data / "progress.yml"
+    args = [
+        str(data / "generated" / "vcpkg_packages.yml"),
+        str(data / "vcpkg_overrides.yml"),
+        str(data / "external_projects.yml"),
+        str(data / "excluded_c_libraries.yml"),
+        str(output),
+    ]
+    if db_file is None:
+        merge.load_and_merge_yaml(*args)
+    else:
+        with closing(progress_store.open_store(db_file)) as conn:
+            merge.load_and_merge_yaml(*args, conn)
+    return output.read_text(encoding="utf-8")
+
+
+def test_port_round_trip_keeps_dates(tmp_path):
+    ports = [{"name": "fmt", "status": "✅", "modules_support_date": date(2022, 10, 11)},
+             {"name": "zlib", "status": "❔", "modules_support_date": ""}]
+    with closing(progress_store.open_store(tmp_path / "store.db")) as conn:
+        progress_store.replace_ports(conn, "progress", ports)
+        loaded = progress_store.load_ports(conn, "progress")
+        assert progress_store.count_ports(conn, "progress") == 2
+        assert progress_store.count_ports(conn, "progress", status="✅") == 1
+
+    assert loaded == ports
+    assert isinstance(loaded[0]["modules_support_date"], date)
+    assert "modules_support_date: 2022-10-11\n" in yaml.safe_dump(loaded[0], allow_unicode=True)
+
+
+def test_port_round_trip_keeps_value_types(tmp_path):
+    ports = [
+        {"name": "quoted", "modules_support_date": "2025-05-15"},
+        {"name": "timestamp", "modules_support_date": datetime(2025, 5, 15, 10, 30, tzinfo=timezone.utc)},
+        {"name": "naive", "modules_support_date": datetime(2025, 5, 15, 10, 30)},
+    ]
+    with closing(progress_store.open_store(tmp_path / "store.db")) as conn:
+        progress_store.replace_ports(conn, "progress", ports)
+        loaded = progress_store.load_ports(conn, "progress")
+
+    assert loaded == ports
+    assert [type(item["modules_support_date"]) for item in loaded] == [str, datetime, datetime]
+
+
+def test_vcpkg_packages_round_trip(tmp_path):
+    write_data_files(tmp_path, [])
+    packages_file = tmp_path / "data" / "generated" / "vcpkg_packages.yml"
+    with closing(progress_store.open_store(tmp_path / "store.db")) as conn:
+        from_yaml = merge.load_vcpkg_packages(str(packages_file), conn)
+        from_store = merge.load_vcpkg_packages(str(packages_file), conn)
+
+    assert from_yaml == from_store == VCPKG_PACKAGES
+    assert yaml.dump(from_store, default_flow_style=False, allow_unicode=True) == \
+        yaml.dump(VCPKG_PACKAGES, default_flow_style=False, allow_unicode=True)
+
+
+def test_merge_output_matches_with_and_without_store(tmp_path):
+    write_data_files(tmp_path, ["zlib"])
+    db_file = tmp_path / "store.db"
+
+    expected = run_merge(tmp_path)
+    # First run imports the inputs, second one reads them back from the store
+    assert run_merge(tmp_path, db_file) == expected
+    assert run_merge(tmp_path, db_file) == expected
+    assert "modules_support_date: 2022-10-11\n" in expected
+
+    write_excluded(tmp_path, [])
+    expected = run_merge(tmp_path)
+    assert run_merge(tmp_path, db_file) == expected
+
+
+def test_merge_notices_files_restored_with_old_mtime(tmp_path):
+    write_data_files(tmp_path, [])
+    overrides_file = tmp_path / "data" / "vcpkg_overrides.yml"
+    db_file = tmp_path / "store.db"
+    run_merge(tmp_path, db_file)
+
+    # Same size and mtime, different contents
+    stat = overrides_file.stat()
+    overrides_file.write_text(VCPKG_OVERRIDES.replace("status: ✅", "status: ❌"), encoding="utf-8")
+    os.utime(overrides_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert overrides_file.stat().st_size == stat.st_size
+
+    expected = run_merge(tmp_path)
+    assert run_merge(tmp_path, db_file) == expected
+
+
+def test_merge_output_keeps_quoted_dates_and_timestamps(tmp_path):
+    write_data_files(tmp_path, [])
+    (tmp_path / "data" / "external_projects.yml").write_text(EXTERNAL_PROJECTS + """\
+- name: quoted-date
+  modules_support_date: "2025-05-15"
+  status: ✅
+- name: timestamp
+  modules_support_date: 2025-05-15 10:30:00
+  status: ✅
+""", encoding="utf-8")
+    db_file = tmp_path / "store.db"
+
+    expected = run_merge(tmp_path)
+    assert run_merge(tmp_path, db_file) == expected
+    assert run_merge(tmp_path, db_file) == expected
+    assert "modules_support_date: '2025-05-15'\n" in expected
+    assert "modules_support_date: 2025-05-15 10:30:00\n" in expected
+
+
+def test_merge_accepts_external_project_without_name(tmp_path):
+    write_data_files(tmp_path, [])
+    (tmp_path / "data" / "external_projects.yml").write_text(EXTERNAL_PROJECTS + """\
+- homepage: https://example.com/unnamed
+  status: ⚙️
+""", encoding="utf-8")
+    db_file = tmp_path / "store.db"
+
+    expected = run_merge(tmp_path)
+    assert run_merge(tmp_path, db_file) == expected
+    assert run_merge(tmp_path, db_file) == expected
+    assert "name: Unknown\n" in expected
+
+
+def git(root: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=root, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+def run_compute(db_file: Path | None = None) -> list[dict]:
+    if db_file is None:
+        compute_completion_status.compute_cumulative_stats()
+    else:
+        with closing(progress_store.open_store(db_file)) as conn:
+            compute_completion_status.compute_cumulative_stats(conn)
+    return json.loads(compute_completion_status.OUTPUT_FILE.read_text())
+
+
+def without_current_date(stats: list[dict]) -> list[dict]:
+    """Drop the timestamp of the trailing current-state entry, which is taken at run time."""
+    return stats[:-1] + [{key: value for key, value in stats[-1].items() if key != "commit_date"}]
+
+
+def test_compute_output_matches_after_exclusions_change(tmp_path, monkeypatch):
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "commit", "-q", "--allow-empty", "-m", "no data yet")
+    skipped_sha = git(tmp_path, "rev-parse", "HEAD")
+    write_data_files(tmp_path, [])
+    git(tmp_path, "add", "data")
+    git(tmp_path, "commit", "-q", "-m", "add data")
+    git(tmp_path, "update-ref", "refs/remotes/origin/master", "HEAD")
+    (tmp_path / "static").mkdir()
+    monkeypatch.chdir(tmp_path)
+    db_file = tmp_path / "store.db"
+
+    write_excluded(tmp_path, [])
+    run_merge(tmp_path, db_file)
+    before = run_compute(db_file)
+    assert without_current_date(before) == without_current_date(run_compute())
+    # Last entry is the current state counted from progress.yml
+    assert [entry["total"] for entry in before] == [3, 4]
+
+    write_excluded(tmp_path, ["zlib"])
+    run_merge(tmp_path, db_file)
+    with closing(progress_store.open_store(db_file)) as conn:
+        assert progress_store.is_current(conn, "progress_source", Path("data") / "progress.yml")
+    after = run_compute(db_file)
+    assert without_current_date(after) == without_current_date(run_compute())
+    assert [entry["total"] for entry in after] == [2, 3]
+
+    with closing(progress_store.open_store(db_file)) as conn:
+        assert progress_store.is_commit_skipped(conn, skipped_sha)
+
+    # A new counting logic version drops the cached rows
+    monkeypatch.setattr(progress_store, "COMMIT_STATS_VERSION", progress_store.COMMIT_STATS_VERSION + 1)
+    with closing(progress_store.open_store(db_file)) as conn:
+        progress_store.reset_stale_commit_stats(conn, {"zlib"})
+        assert not progress_store.is_commit_skipped(conn, skipped_sha)
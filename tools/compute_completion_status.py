@@ -9,9 +9,17 @@ This script:
 5. Outputs to static/data/cumulative_stats.json
 
 No working tree modifications - safe to run with uncommitted changes.
+
+With --db, per-commit stats (and commits skipped for lacking data files) are
+cached in the SQLite store keyed by sha, so only commits not seen before are
+read with git show, and the current state is counted from the store's progress
+table (see progress_store.py).
 """
 
+import argparse
 import json
+import sqlite3
+from contextlib import closing, nullcontext
 import subprocess
 from datetime import datetime
 from io import StringIO
@@ -20,6 +28,8 @@ from pathlib import Path
 import yaml
 from termcolor import colored
 
+import progress_store
+
 # Git/date formats
 GIT_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S %z"
 ISO_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
@@ -142,6 +152,7 @@ def get_commits_since(since_date: datetime | None) -> list[dict]:
     return commits
 
 
+# NOTE: bump progress_store.COMMIT_STATS_VERSION when changing how commits are counted
 def merge_yaml_data(
     vcpkg_packages: str,
     vcpkg_overrides: str | None,
@@ -185,8 +196,8 @@ def merge_yaml_data(
     return completed, total
 
 
-def process_commit(sha: str, date: str, excluded_c_libs: set[str]) -> dict | None:
-    """Process a single commit and return stats using git show (no checkout)."""
+def read_commit_stats(sha: str, date: str, excluded_c_libs: set[str]) -> dict | None:
+    """Compute stats for a single commit using git show (no checkout)."""
     # Read vcpkg_packages (required)
     vcpkg_packages = git_show(sha, VCPKG_PACKAGES)
     if not vcpkg_packages:
@@ -209,18 +220,46 @@ def process_commit(sha: str, date: str, excluded_c_libs: set[str]) -> dict | Non
         return None
 
 
-def get_current_stats() -> dict | None:
-    """Read current stats from local progress.yml file."""
+def process_commit(
+    sha: str, date: str, excluded_c_libs: set[str], conn: sqlite3.Connection | None = None
+) -> dict | None:
+    """
+    Process a single commit and return stats, reusing the store's cached result if any.
+    The caller must have called progress_store.reset_stale_commit_stats for excluded_c_libs.
+    """
+    if conn is None:
+        return read_commit_stats(sha, date, excluded_c_libs)
+    
+    if progress_store.is_commit_skipped(conn, sha):
+        return None
+    cached = progress_store.get_commit_stats_by_sha(conn, sha)
+    if cached:
+        return cached
+    
+    stats = read_commit_stats(sha, date, excluded_c_libs)
+    if stats:
+        progress_store.upsert_commit_stats(conn, sha, stats)
+    else:
+        progress_store.mark_commit_skipped(conn, sha)
+    return stats
+
+
+def get_current_stats(conn: sqlite3.Connection | None = None) -> dict | None:
+    """Read current stats from local progress.yml file (or the store, if it is up to date)."""
     progress_file = DATA_DIR / "progress.yml"
     if not progress_file.exists():
         return None
     
-    with progress_file.open("r") as f:
-        progress = yaml.safe_load(f)
-    
-    ports = progress.get("ports", [])
-    completed = len([p for p in ports if p.get("status") == "✅"])
-    total = len(ports)
+    if conn is not None and progress_store.is_current(conn, "progress_source", progress_file):
+        completed = progress_store.count_ports(conn, "progress", status="✅")
+        total = progress_store.count_ports(conn, "progress")
+    else:
+        with progress_file.open("r") as f:
+            progress = yaml.safe_load(f)
+        
+        ports = progress.get("ports", [])
+        completed = len([p for p in ports if p.get("status") == "✅"])
+        total = len(ports)
     
     # Use current time
     from datetime import timezone
@@ -233,14 +272,17 @@ def get_current_stats() -> dict | None:
     }
 
 
-def main() -> None:
+def compute_cumulative_stats(conn: sqlite3.Connection | None = None) -> None:
     print()
     print(colored("📊 Computing historical completion status...", "cyan", attrs=["bold"]))
     print()
     
     # Load excluded C libraries from local file (used for all calculations)
     excluded_c_libs_file = EXCLUDED_C_LIBS
-    if excluded_c_libs_file.exists():
+    if conn is not None and progress_store.is_current(conn, "excluded_c_libraries_source", excluded_c_libs_file):
+        excluded_c_libs = progress_store.load_excluded_c_libraries(conn)
+        print(colored(f"🚫 Loaded {len(excluded_c_libs)} excluded C libraries", "blue"))
+    elif excluded_c_libs_file.exists():
         with excluded_c_libs_file.open("r") as f:
             excluded_c_libs = load_excluded_c_libraries(f.read())
         print(colored(f"🚫 Loaded {len(excluded_c_libs)} excluded C libraries", "blue"))
@@ -248,6 +290,9 @@ def main() -> None:
         excluded_c_libs = set()
         print(colored("⚠️  No excluded C libraries file found", "yellow"))
     
+    if conn is not None:
+        progress_store.reset_stale_commit_stats(conn, excluded_c_libs)
+    
     # Load historical data
     historical = load_historical_data()
     latest_date = get_latest_date(historical)
@@ -272,7 +317,7 @@ def main() -> None:
                 end=" "
             )
             
-            stats = process_commit(commit["sha"], commit["date"], excluded_c_libs)
+            stats = process_commit(commit["sha"], commit["date"], excluded_c_libs, conn)
             if stats:
                 new_data.append(stats)
                 print(colored(f"✓ {stats['completed']}/{stats['total']}", "green"))
@@ -280,7 +325,7 @@ def main() -> None:
                 print(colored("skipped", "yellow"))
     
     # Also add current local state (from progress.yml)
-    current = get_current_stats()
+    current = get_current_stats(conn)
     if current:
         # Check if we should add it (different from last entry)
         merged_so_far = historical + new_data
@@ -310,5 +355,16 @@ def main() -> None:
         print(colored(f"   (+{len(new_data)} new)", "cyan"))
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compute completion status for the historical chart.")
+    parser.add_argument("--db", nargs="?", const=str(progress_store.DEFAULT_DB_FILE), default=None,
+                        help="Cache per-commit stats in the SQLite store "
+                             f"(default path: {progress_store.DEFAULT_DB_FILE})")
+    args = parser.parse_args()
+    
+    with closing(progress_store.open_store(args.db)) if args.db else nullcontext() as conn:
+        compute_cumulative_stats(conn)
+
+
 if __name__ == "__main__":
     main()
@@ -5,9 +5,12 @@ import argparse
 import yaml
 import time
 import tempfile
+from contextlib import closing
 from git import Repo
 from termcolor import colored
 
+import progress_store
+
 
 def get_git_revision_count(repo: Repo, file_path: str) -> int:
     """Get commit count for a file using git rev-list (much faster than iter_commits)."""
@@ -38,6 +41,9 @@ def read_vcpkg_json(json_path):
 
 def main():
     parser = argparse.ArgumentParser(description="Process the vcpkg repository to extract package details and revision counts.")
+    parser.add_argument("--db", nargs="?", const=str(progress_store.DEFAULT_DB_FILE), default=None,
+                        help="Also write the ports into the SQLite store, so the merge can skip re-parsing the YAML "
+                             f"(default path: {progress_store.DEFAULT_DB_FILE})")
     args = parser.parse_args()
 
     # Setup tmp directory for vcpkg clone in SYSTEM temp folder (completely isolated from project)
@@ -140,5 +146,13 @@ def main():
 
     print("\n" + colored(f"Processed and saved details for {file_count} ports to {output_path}", "blue"))
 
+    if args.db:
+        # Lets merge_vcpkg_package_list_progress.py --db skip re-parsing the YAML
+        with closing(progress_store.open_store(args.db)) as conn:
+            progress_store.replace_ports(conn, 'ports', ports_data)
+            progress_store.write_meta(conn, 'vcpkg_packages_header', header_info)
+            progress_store.write_meta(conn, 'vcpkg_packages_source', progress_store.file_signature(output_path))
+        print(colored(f"Stored {file_count} ports in {args.db}", "blue"))
+
 if __name__ == '__main__':
     main()
@@ -1,9 +1,12 @@
 import os
 import argparse
 import yaml
+from contextlib import closing, nullcontext
 from datetime import datetime, date
 from termcolor import colored
 
+import progress_store
+
 def get_date_value(date_val):
     """Convert a date value to string, handling both string and date objects."""
     if date_val is None:
@@ -12,19 +15,54 @@ def get_date_value(date_val):
         return date_val.strftime('%Y-%m-%d')
     return str(date_val).strip()
 
-def load_excluded_c_libraries(excluded_file):
+def load_excluded_c_libraries(excluded_file, conn=None):
     """Load the list of C libraries to exclude from tracking."""
     if not os.path.exists(excluded_file):
         return set()
     
+    if conn is not None and progress_store.is_current(conn, 'excluded_c_libraries_source', excluded_file):
+        return progress_store.load_excluded_c_libraries(conn)
+    
     with open(excluded_file, 'r', encoding='utf-8') as f:
         data = yaml.safe_load(f)
     
-    if data and 'libraries' in data:
-        return set(data['libraries'])
-    return set()
+    excluded = set(data['libraries']) if data and 'libraries' in data else set()
+    if conn is not None:
+        progress_store.replace_excluded_c_libraries(conn, excluded)
+        progress_store.write_meta(conn, 'excluded_c_libraries_source', progress_store.file_signature(excluded_file))
+    return excluded
+
+def load_yaml_items(yaml_file, key, table, conn=None):
+    """Load the list under key from a YAML file, from the SQLite store if it is up to date."""
+    if conn is not None and progress_store.is_current(conn, f'{table}_source', yaml_file):
+        return progress_store.load_ports(conn, table)
+    
+    with open(yaml_file, 'r', encoding='utf-8') as f:
+        items = yaml.safe_load(f).get(key, [])
+    
+    if conn is not None:
+        progress_store.replace_ports(conn, table, items)
+        progress_store.write_meta(conn, f'{table}_source', progress_store.file_signature(yaml_file))
+    return items
+
+def load_vcpkg_packages(vcpkg_packages_file, conn=None):
+    """Load the generated vcpkg packages, from the SQLite store if it is up to date."""
+    if conn is not None and progress_store.is_current(conn, 'vcpkg_packages_source', vcpkg_packages_file):
+        return {
+            'header': progress_store.read_meta(conn, 'vcpkg_packages_header'),
+            'ports': progress_store.load_ports(conn, 'ports'),
+        }
+
+    with open(vcpkg_packages_file, 'r', encoding='utf-8') as f:
+        vcpkg_packages = yaml.safe_load(f)
+
+    if conn is not None:
+        progress_store.replace_ports(conn, 'ports', vcpkg_packages['ports'])
+        progress_store.write_meta(conn, 'vcpkg_packages_header', vcpkg_packages['header'])
+        progress_store.write_meta(conn, 'vcpkg_packages_source', progress_store.file_signature(vcpkg_packages_file))
+    return vcpkg_packages
 
-def load_and_merge_yaml(vcpkg_packages_file, vcpkg_overrides_file, external_projects_file, excluded_c_libs_file, output_file):
+def load_and_merge_yaml(vcpkg_packages_file, vcpkg_overrides_file, external_projects_file, excluded_c_libs_file, output_file, conn=None):
     print()
     print(colored("📦 Merging C++ modules progress data...", "cyan", attrs=["bold"]))
     print()
@@ -36,16 +74,12 @@ def load_and_merge_yaml(vcpkg_packages_file, vcpkg_overrides_file, external_proj
     print()
     
     # Load excluded C libraries
-    excluded_c_libs = load_excluded_c_libraries(excluded_c_libs_file)
-    
-    with open(vcpkg_packages_file, 'r', encoding='utf-8') as f:
-        vcpkg_packages = yaml.safe_load(f)
+    excluded_c_libs = load_excluded_c_libraries(excluded_c_libs_file, conn)
     
-    with open(vcpkg_overrides_file, 'r', encoding='utf-8') as f:
-        vcpkg_overrides = yaml.safe_load(f)
+    vcpkg_packages = load_vcpkg_packages(vcpkg_packages_file, conn)
     
-    with open(external_projects_file, 'r', encoding='utf-8') as f:
-        external_projects = yaml.safe_load(f)
+    overrides_ports = load_yaml_items(vcpkg_overrides_file, 'ports', 'vcpkg_overrides', conn)
+    external_ports = load_yaml_items(external_projects_file, 'projects', 'external_projects', conn)
     
     # Extract vcpkg package names for validation
     vcpkg_ports_list = vcpkg_packages['ports']
@@ -61,7 +95,6 @@ def load_and_merge_yaml(vcpkg_packages_file, vcpkg_overrides_file, external_proj
         print()
     
     # Create a dictionary from the overrides data for easy access
-    overrides_ports = vcpkg_overrides.get('ports', [])
     overrides_dict = {item['name']: item for item in overrides_ports}
     
     # Extract the vcpkg packages header
@@ -84,7 +117,6 @@ def load_and_merge_yaml(vcpkg_packages_file, vcpkg_overrides_file, external_proj
         merged_ports.append(item)
     
     # Add external projects (not in vcpkg)
-    external_ports = external_projects.get('projects', [])
     for item in external_ports:
         merged_ports.append({
             "name": item.get("name", "Unknown"),
@@ -167,6 +199,11 @@ def load_and_merge_yaml(vcpkg_packages_file, vcpkg_overrides_file, external_proj
         f.write(header_comment)
         yaml.safe_dump(merged_data, f, allow_unicode=True)
     
+    if conn is not None:
+        # Lets compute_completion_status.py --db count from the store instead
+        progress_store.replace_ports(conn, 'progress', merged_ports)
+        progress_store.write_meta(conn, 'progress_source', progress_store.file_signature(output_file))
+    
     # Print summary
     print(colored("  Output:", "blue"))
     print(f"    • {colored(output_file, 'white')}")
@@ -184,6 +221,9 @@ def load_and_merge_yaml(vcpkg_packages_file, vcpkg_overrides_file, external_proj
 
 def main():
     parser = argparse.ArgumentParser(description="Merge vcpkg_packages.yml, vcpkg_overrides.yml, and external_projects.yml into progress.yml")
+    parser.add_argument("--db", nargs="?", const=str(progress_store.DEFAULT_DB_FILE), default=None,
+                        help="Also keep the inputs and the merged result in the SQLite store, reading unchanged inputs back from it "
+                             f"(default path: {progress_store.DEFAULT_DB_FILE})")
     args = parser.parse_args()
     
     base_path = os.path.dirname(os.path.abspath(__file__))
@@ -199,7 +239,8 @@ def main():
     excluded_c_libs_path = os.path.join(data_path, 'excluded_c_libraries.yml')
     progress_path = os.path.join(data_path, 'progress.yml')
     
-    load_and_merge_yaml(vcpkg_packages_path, vcpkg_overrides_path, external_projects_path, excluded_c_libs_path, progress_path)
+    with closing(progress_store.open_store(args.db)) if args.db else nullcontext() as conn:
+        load_and_merge_yaml(vcpkg_packages_path, vcpkg_overrides_path, external_projects_path, excluded_c_libs_path, progress_path, conn)
 
 if __name__ == '__main__':
     main()
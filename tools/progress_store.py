@@ -0,0 +1,240 @@
+"""
+Optional SQLite backing store shared by the data tools.
+
+The YAML/JSON files under data/ and static/data/ stay the source of truth for
+Hugo and for hand edits, and are always written from the in-memory results.
+When a tool is run with --db, it additionally writes its results into this
+store, and the next tool reads them back from it instead of re-parsing a file
+that has not changed since (tracked by a fingerprint in the meta table).
+
+Tables:
+- ports                 vcpkg ports (generate_vcpkg_package_list.py)
+- vcpkg_overrides       rows of data/vcpkg_overrides.yml
+- external_projects     rows of data/external_projects.yml
+- excluded_c_libraries  names from data/excluded_c_libraries.yml
+- progress              merged result (merge_vcpkg_package_list_progress.py)
+- commit_stats          per-commit history (compute_completion_status.py)
+- skipped_commits       commits without usable data files, so they are not re-read
+- meta                  file headers and fingerprints of imported files
+"""
+
+import hashlib
+import json
+import sqlite3
+from datetime import date, datetime
+from pathlib import Path
+
+DEFAULT_DB_FILE = Path(__file__).resolve().parent.parent / "data" / "generated" / "arewemodulesyet.db"
+
+# Tables holding one serialized port/project per row, keyed by their position
+# in the source file. Names are not stored separately: they are not unique
+# (progress keeps external projects that are also vcpkg ports) and may be
+# missing from hand-written entries.
+PORT_TABLES = ("ports", "vcpkg_overrides", "external_projects", "progress")
+
+# YAML parses unquoted dates and timestamps into date/datetime objects, while
+# quoted ones stay strings. Rows are stored as JSON with those objects tagged,
+# so they come back with the same type and dump to the same YAML.
+DATE_TAG = "__date__"
+DATETIME_TAG = "__datetime__"
+
+# Bumped whenever the counting in compute_completion_status.py changes
+# (merge_yaml_data, read_commit_stats or the files they read), so cached
+# commit stats computed by the old logic are dropped.
+COMMIT_STATS_VERSION = 1
+
+# Bumped whenever SCHEMA changes. The store only holds data derived from the
+# files in the repository, so an outdated one is dropped and rebuilt.
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS excluded_c_libraries (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS commit_stats (
+    sha         TEXT PRIMARY KEY,
+    commit_date TEXT NOT NULL,
+    completed   INTEGER NOT NULL,
+    total       INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skipped_commits (
+    sha TEXT PRIMARY KEY
+);
+""" + "".join(
+    f"""
+CREATE TABLE IF NOT EXISTS {table} (
+    position INTEGER PRIMARY KEY,
+    status   TEXT,
+    data     TEXT NOT NULL
+);
+"""
+    for table in PORT_TABLES
+) + """
+CREATE INDEX IF NOT EXISTS idx_progress_status ON progress (status);
+"""
+
+
+def open_store(db_path: str | Path) -> sqlite3.Connection:
+    """Open (and create if needed) the store at db_path."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        tables = [name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            conn.execute(f'DROP TABLE "{table}"')
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _check_table(table: str) -> None:
+    if table not in PORT_TABLES:
+        raise ValueError(f"Unknown port table: {table}")
+
+
+def _encode(item: dict) -> str:
+    def default(value):
+        if isinstance(value, datetime):
+            return {DATETIME_TAG: value.isoformat()}
+        if isinstance(value, date):
+            return {DATE_TAG: value.isoformat()}
+        raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+    return json.dumps(item, ensure_ascii=False, default=default)
+
+
+def _decode(data: str) -> dict:
+    def object_hook(obj):
+        if len(obj) == 1:
+            if DATETIME_TAG in obj:
+                return datetime.fromisoformat(obj[DATETIME_TAG])
+            if DATE_TAG in obj:
+                return date.fromisoformat(obj[DATE_TAG])
+        return obj
+
+    return json.loads(data, object_hook=object_hook)
+
+
+def write_meta(conn: sqlite3.Connection, key: str, value: dict) -> None:
+    """Store a header dict (e.g. the vcpkg_packages.yml header) under key."""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, _encode(value)),
+        )
+
+
+def read_meta(conn: sqlite3.Connection, key: str) -> dict | None:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return _decode(row[0]) if row else None
+
+
+def file_signature(path: str | Path) -> dict:
+    """Return a fingerprint of a file's contents, used to tell if an import is stale.
+
+    Hashing is cheap next to the YAML parse it saves, and unlike mtime and size
+    it also catches files restored with their old timestamps (cp -p, rsync, ...).
+    """
+    return {"sha256": hashlib.sha256(Path(path).read_bytes()).hexdigest()}
+
+
+def is_current(conn: sqlite3.Connection, key: str, path: str | Path) -> bool:
+    """Whether the file at path is unchanged since it was recorded under key."""
+    return Path(path).exists() and read_meta(conn, key) == file_signature(path)
+
+
+def replace_ports(conn: sqlite3.Connection, table: str, items: list[dict]) -> None:
+    """Replace the full contents of a port table, keeping the given order."""
+    _check_table(table)
+    with conn:
+        conn.execute(f"DELETE FROM {table}")
+        conn.executemany(
+            f"INSERT INTO {table} (position, status, data) VALUES (?, ?, ?)",
+            (
+                (position, item.get("status"), _encode(item))
+                for position, item in enumerate(items)
+            ),
+        )
+
+
+def load_ports(conn: sqlite3.Connection, table: str) -> list[dict]:
+    """Return all rows of a port table in their original order."""
+    _check_table(table)
+    rows = conn.execute(f"SELECT data FROM {table} ORDER BY position")
+    return [_decode(data) for (data,) in rows]
+
+
+def count_ports(conn: sqlite3.Connection, table: str = "progress", status: str | None = None) -> int:
+    """Count rows of a port table, optionally only those with the given status."""
+    _check_table(table)
+    if status is None:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    return conn.execute(
+        f"SELECT COUNT(*) FROM {table} WHERE status = ?", (status,)
+    ).fetchone()[0]
+
+
+def replace_excluded_c_libraries(conn: sqlite3.Connection, names: set[str]) -> None:
+    with conn:
+        conn.execute("DELETE FROM excluded_c_libraries")
+        conn.executemany(
+            "INSERT OR IGNORE INTO excluded_c_libraries (name) VALUES (?)",
+            ((name,) for name in sorted(names)),
+        )
+
+
+def load_excluded_c_libraries(conn: sqlite3.Connection) -> set[str]:
+    """Return the stored excluded C library names."""
+    return {name for (name,) in conn.execute("SELECT name FROM excluded_c_libraries")}
+
+
+def reset_stale_commit_stats(conn: sqlite3.Connection, excluded_c_libs: set[str]) -> None:
+    """Drop cached commit stats if they were computed with a different exclusion list
+    or by an older version of the counting logic.
+
+    The excluded C libraries come from the working tree and are applied to every
+    historical commit, so they are part of what a cached count depends on.
+    """
+    inputs = {
+        "version": COMMIT_STATS_VERSION,
+        "excluded_c_libraries": hashlib.sha256("\n".join(sorted(excluded_c_libs)).encode()).hexdigest()
+    }
+    if read_meta(conn, "commit_stats_inputs") == inputs:
+        return
+    with conn:
+        conn.execute("DELETE FROM commit_stats")
+        conn.execute("DELETE FROM skipped_commits")
+    write_meta(conn, "commit_stats_inputs", inputs)
+
+
+def upsert_commit_stats(conn: sqlite3.Connection, sha: str, stats: dict) -> None:
+    """Store stats ({commit_date, completed, total}) for a commit."""
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO commit_stats (sha, commit_date, completed, total) VALUES (?, ?, ?, ?)",
+            (sha, stats["commit_date"], stats["completed"], stats["total"]),
+        )
+
+
+def get_commit_stats_by_sha(conn: sqlite3.Connection, sha: str) -> dict | None:
+    row = conn.execute(
+        "SELECT commit_date, completed, total FROM commit_stats WHERE sha = ?", (sha,)
+    ).fetchone()
+    if not row:
+        return None
+    return {"commit_date": row[0], "completed": row[1], "total": row[2]}
+
+
+def mark_commit_skipped(conn: sqlite3.Connection, sha: str) -> None:
+    """Remember that a commit has no usable data, so it is not read again."""
+    with conn:
+        conn.execute("INSERT OR IGNORE INTO skipped_commits (sha) VALUES (?)", (sha,))
+
+
+def is_commit_skipped(conn: sqlite3.Connection, sha: str) -> bool:
+    return conn.execute("SELECT 1 FROM skipped_commits WHERE sha = ?", (sha,)).fetchone() is not None